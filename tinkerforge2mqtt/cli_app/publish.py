@@ -1,4 +1,5 @@
 import logging
+import random
 import time
 import socket
 from typing import Optional
@@ -65,7 +66,7 @@ def connect_with_retry(ipcon: IPConnection, connect_kwargs: dict, max_retries: O
 
     while max_retries is None or attempt <= max_retries:
         try:
-            print(f'Connecting to {connect_kwargs} (attempt {attempt + 1})')
+            logger.info('Connecting to %s (attempt %d)', connect_kwargs, attempt + 1)
             ipcon.connect(**connect_kwargs)
             print('✓ Connected successfully!')
             return True
@@ -75,11 +76,11 @@ def connect_with_retry(ipcon: IPConnection, connect_kwargs: dict, max_retries: O
                 print(f'✗ Failed to connect after {max_retries} attempts. Last error: {e}')
                 return False
 
-            print(f'✗ Connection failed: {e}. Retrying in {delay:.1f} seconds...')
+            logger.warning('✗ Connection failed: %s. Retrying in %.1f seconds...', e, delay)
             time.sleep(delay)
 
-            # Exponential backoff with jitter, max 60 seconds
-            delay = min(delay * 1.5, 60.0)
+            # Exponential backoff with "decorrelated jitter", max 60 seconds
+            delay = min(random.uniform(initial_delay, delay * 3.0), 60.0)
 
     return False
 
@@ -102,7 +103,7 @@ def connect_mqtt_with_retry(user_settings: UserSettings, verbosity: TyroVerbosit
 
     while max_retries is None or attempt <= max_retries:
         try:
-            print(f'Connecting to MQTT (attempt {attempt + 1})')
+            logger.info('Connecting to MQTT (attempt %d)', attempt + 1)
             mqtt_client = get_connected_client(settings=user_settings.mqtt, verbosity=verbosity)
             print('✓ MQTT connected successfully!')
             return mqtt_client
@@ -112,11 +113,11 @@ def connect_mqtt_with_retry(user_settings: UserSettings, verbosity: TyroVerbosit
                 print(f'✗ Failed to connect to MQTT after {max_retries} attempts. Last error: {e}')
                 return None
 
-            print(f'✗ MQTT connection failed: {e}. Retrying in {delay:.1f} seconds...')
+            logger.warning('✗ MQTT connection failed: %s. Retrying in %.1f seconds...', e, delay)
             time.sleep(delay)
 
-            # Exponential backoff with jitter, max 60 seconds
-            delay = min(delay * 1.5, 60.0)
+            # Exponential backoff with "decorrelated jitter", max 60 seconds
+            delay = min(random.uniform(initial_delay, delay * 3.0), 60.0)
 
     return None
 
@@ -143,10 +144,16 @@ def publish_loop(verbosity: TyroVerbosityArgType):
 
     mqtt_client.loop_start()
 
+    # Reuse the connection and the devices handler (with all mapped devices) for every reconnect:
+    ipcon = IPConnection()
+    ipcon.set_auto_reconnect(False)  # Reconnecting is done by the loop below
+    devices_handler = DevicesHandler(ipcon, mqtt_client=mqtt_client, user_settings=user_settings)
+    ipcon.register_callback(IPConnection.CALLBACK_ENUMERATE, devices_handler)
+    ipcon.register_callback(IPConnection.CALLBACK_DISCONNECTED, devices_handler.disconnected_handler)
+
     # Main connection and operation loop - never give up!
     while True:
-        ipcon = IPConnection()
-        devices_handler = None
+        devices_handler.connection_lost.clear()
 
         try:
             # Connect with retry logic - for main loop, never give up (max_retries=None)
@@ -155,15 +162,17 @@ def publish_loop(verbosity: TyroVerbosityArgType):
                 print("Unexpected connection failure, retrying...")
                 continue
 
-            # Setup devices handler after successful connection
-            devices_handler = DevicesHandler(ipcon, mqtt_client=mqtt_client, user_settings=user_settings)
-            ipcon.register_callback(IPConnection.CALLBACK_ENUMERATE, devices_handler)
+            # Enumerate only once: Devices that are plugged in later, will send
+            # ENUMERATION_TYPE_CONNECTED by themselves.
+            ipcon.enumerate()
 
             # Main operation loop
             while True:
                 try:
-                    ipcon.enumerate()
-                    time.sleep(5)
+                    if devices_handler.connection_lost.wait(5.0):
+                        logger.warning('Connection lost during operation. Will reconnect...')
+                        break  # Break inner loop to reconnect
+                    devices_handler.poll()
                 except KeyboardInterrupt:
                     logger.info('Keyboard interrupt')
                     ipcon.disconnect()
@@ -176,10 +185,8 @@ def publish_loop(verbosity: TyroVerbosityArgType):
         except KeyboardInterrupt:
             logger.info('Keyboard interrupt during connection setup')
             try:
-                if ipcon:
-                    ipcon.disconnect()
-                if mqtt_client:
-                    mqtt_client.disconnect()
+                ipcon.disconnect()
+                mqtt_client.disconnect()
             except Exception:
                 pass
             return  # Exit the entire function
@@ -189,8 +196,7 @@ def publish_loop(verbosity: TyroVerbosityArgType):
 
         # Always clean up before reconnection attempt
         try:
-            if ipcon:
-                ipcon.disconnect()
+            ipcon.disconnect()
         except Exception:
             pass  # Ignore disconnect errors
 
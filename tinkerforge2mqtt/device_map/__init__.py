@@ -18,6 +18,9 @@ class MapRegistry:
         assert issubclass(MapClass, DeviceMapBase), f'Class {MapClass} must be subclass of {DeviceMapBase}'
         device_identifier = MapClass.device_identifier
         assert device_identifier in DEVICE_CLASSES, f'Unknown device identifier: {device_identifier} from {MapClass}'
+        assert (
+            device_identifier not in self._registry
+        ), f'Duplicate map class for {device_identifier=}: {MapClass} and {self._registry[device_identifier]}'
         self._registry[device_identifier] = MapClass
 
     def get_map_class(self, device_identifier) -> type[DeviceMapBase] | None:
@@ -1,4 +1,9 @@
 import logging
+import queue
+import time
+from collections.abc import Iterable, Sequence
+from struct import Struct
+from threading import Lock, Thread
 
 from ha_services.mqtt4homeassistant.components.light import Light
 from paho.mqtt.client import Client
@@ -7,11 +12,16 @@ from tinkerforge.bricklet_dmx import BrickletDMX
 from tinkerforge2mqtt.device_map import register_map_class
 from tinkerforge2mqtt.device_map_utils.base import DeviceMapBase
 from tinkerforge2mqtt.device_map_utils.utils import print_exception_decorator
+from tinkerforge2mqtt.utilities.dmx import MAX_BRIGHTNESS, scale_rgbw
 
 
 logger = logging.getLogger(__name__)
 
-MAX_BRIGHTNESS = 255
+DEFAULT_RGBW = (MAX_BRIGHTNESS,) * 4
+FLUSH_DELAY = 0.02  # seconds to collect a burst of Home Assistant commands into one DMX frame
+
+RGBW_STRUCT = Struct('4B')  # The 4 channels of a RGBW fixture in the DMX frame
+
 
 @register_map_class()
 class BrickletDMXMapper(DeviceMapBase):
@@ -21,7 +31,14 @@ class BrickletDMXMapper(DeviceMapBase):
 
     def __init__(self, *, device: BrickletDMX, **kwargs):
         self.device: BrickletDMX = device
-        self.dmx_frame = [0] * 512  # DMX frame with 512 channels
+        self.dmx_frame = bytearray(512)  # DMX frame with 512 channels
+
+        # Frame writing and publishing is done in a separate thread, see _request_flush():
+        self._flush_queue: queue.Queue[bytes | None] = queue.Queue(maxsize=1)
+        self._flush_lock = Lock()
+        self._last_sent_frame: bytes | None = None
+        Thread(target=self._flush_loop, name=f'DMX writer {device.uid_string}', daemon=True).start()
+
         super().__init__(device=device, **kwargs)
 
     @print_exception_decorator
@@ -39,126 +56,201 @@ class BrickletDMXMapper(DeviceMapBase):
             min_brightness=0,
             max_brightness=MAX_BRIGHTNESS,
         )
-        logger.info(f'Creating: {self.dmx_light}')
+        # The state is idempotent and republished regularly, so don't wait for a PUBACK,
+        # but retain it, so that a (re-)subscribing Home Assistant gets the current state:
+        self.dmx_light.qos = 0
+        self.dmx_light.retain = True
+        self._on_state = self.dmx_light.ON  # Used in every callback
+
+        # Initial states, until Home Assistant sends other values (The DMX frame starts with all channels off):
+        self.dmx_light.state_switch = self.dmx_light.OFF
+        self.dmx_light.state_brightness = MAX_BRIGHTNESS
+        self.dmx_light.state_rgbw = DEFAULT_RGBW
+        logger.info('Creating: %s', self.dmx_light)
 
     @print_exception_decorator
     def setup_callbacks(self):
-        logger.info(f'setup_callbacks {self}')
+        logger.info('setup_callbacks %s', self)
         super().setup_callbacks()
 
         try:
             # Set DMX mode to master (sending DMX data)
             self.device.set_dmx_mode(self.device.DMX_MODE_MASTER)
-            logger.info(f'DMX mode set to master (UID: {self.device.uid_string})')
+            logger.info('DMX mode set to master (UID: %s)', self.device.uid_string)
         except Exception as e:
-            logger.error(f'Failed to set DMX mode: {e}')
+            logger.error('Failed to set DMX mode: %s', e)
+
+    def device_reconnected(self):
+        super().device_reconnected()
+        # A restarted bricklet doesn't send our frame anymore: Send it again, even if it's unchanged
+        self._last_sent_frame = None
+        self._request_flush(frame_changed=True)
 
     @print_exception_decorator
     def poll(self):
         super().poll()
-        # DMX lights don't need regular polling for state updates
-        # The light state is maintained by the device itself
-        self.dmx_light.publish(self.mqtt_client)
+        # DMX lights don't need regular polling for state updates:
+        # The light state only changes in the callbacks and is published by _flush_loop().
+        self.publish_component(self.dmx_light)
 
-    @print_exception_decorator
     def switch_callback(self, *, client: Client, component: Light, old_state: str, new_state: str):
-        logger.info(f'{component.name} switch state changed: {old_state!r} -> {new_state!r}')
+        logger.info('%s switch state changed: %r -> %r', component.name, old_state, new_state)
 
         try:
-            is_on = new_state == component.ON
-            rgbw = getattr(component, 'state_rgbw', [MAX_BRIGHTNESS, MAX_BRIGHTNESS, MAX_BRIGHTNESS, MAX_BRIGHTNESS])
+            is_on = new_state == self._on_state
+            rgbw = component.state_rgbw
             if is_on:
                 # Turn on: restore previous brightness and color values
                 # Use current component states for brightness and RGBW
-                brightness = getattr(component, 'state_brightness', MAX_BRIGHTNESS)
+                brightness = component.state_brightness
 
                 self.set_rgbw_fixture(1, rgbw=rgbw, brightness=brightness)
-                logger.info(f'DMX light turned ON - RGBW: (brightness: {brightness}%)')
+                logger.info('DMX light turned ON - RGBW: (brightness: %s)', brightness)
 
             else:
                 self.set_rgbw_fixture(1, rgbw=rgbw, brightness=0)
                 logger.info('DMX light turned OFF')
 
-            # Send DMX frame
-            self.device.write_frame(self.dmx_frame)
-
             # Update component state and publish
             component.set_state_switch(new_state)
         except Exception as e:
-            logger.error(f'Failed to control DMX switch: {e}')
-        self.poll()
+            logger.error('Failed to control DMX switch: %s', e)
+        self._request_flush()
 
-    @print_exception_decorator
     def rgbw_callback(self, *, client: Client, component: Light, old_state: list[int], new_state: list[int]):
-        logger.info(f'{component.name} RGBW state changed: {old_state!r} -> {new_state!r}')
+        logger.info('%s RGBW state changed: %r -> %r', component.name, old_state, new_state)
 
         try:
             # Check if light is currently on
-            switch_state = getattr(component, 'state_switch', component.ON)
-            is_on = switch_state == component.ON
+            is_on = component.state_switch == self._on_state
 
             if is_on:
                 # Get current brightness for scaling
-                brightness = getattr(component, 'state_brightness', MAX_BRIGHTNESS)
+                brightness = component.state_brightness
                 self.set_rgbw_fixture(start_channel=1, rgbw=new_state,brightness=brightness)
 
 
-                logger.info(f'DMX RGB updated:(raw: {new_state}, brightness: {brightness}%)')
+                logger.info('DMX RGB updated:(raw: %s, brightness: %s)', new_state, brightness)
             else:
-                logger.info(f'DMX RGB updated but light is off - storing color: {new_state}')
+                logger.info('DMX RGB updated but light is off - storing color: %s', new_state)
                 self.set_rgbw_fixture(start_channel=1, rgbw=new_state,brightness=0)
             # Update component state and publish
             component.set_state_rgbw(new_state)
         except Exception as e:
-            logger.error(f'Failed to control DMX RGB: {e}')
-        self.poll()
+            logger.error('Failed to control DMX RGB: %s', e)
+        self._request_flush()
 
-    @print_exception_decorator
     def brightness_callback(self, *, client: Client, component: Light, old_state: int, new_state: int):
-        logger.info(f'{component.name} brightness state changed: {old_state!r} -> {new_state!r}')
+        logger.info('%s brightness state changed: %r -> %r', component.name, old_state, new_state)
 
         try:
             # Check if light is currently on
-            switch_state = getattr(component, 'state_switch', component.ON)
-            is_on = switch_state == component.ON
+            is_on = component.state_switch == self._on_state
+            if is_on:
+                rgbw = component.state_rgbw
+                self.set_rgbw_fixture(start_channel=1, rgbw=rgbw, brightness=new_state)
             # Update component state and publish
             component.set_state_brightness(new_state)
 
         except Exception as e:
-            logger.error(f'Failed to control DMX brightness: {e}')
-        self.poll()
+            logger.error('Failed to control DMX brightness: %s', e)
+        self._request_flush()
 
-    @print_exception_decorator
     def set_dmx_channel(self, channel: int, value: int):
         """Set a specific DMX channel value (1-512)"""
-        if 1 <= channel <= 512 and 0 <= value <= MAX_BRIGHTNESS:
-            self.dmx_frame[channel - 1] = value  # DMX channels are 1-based
+        index = channel - 1  # DMX channels are 1-based
+        if index & ~511 or value & ~0xFF:  # Same as: not (0 <= index <= 511 and 0 <= value <= 255)
+            logger.error('Invalid DMX channel (%s) or value (%s)', channel, value)
+            return
+
+        if self.dmx_frame[index] == value:
+            logger.debug('DMX channel %s is already %s', channel, value)
+            return
+        self.dmx_frame[index] = value
+        self._request_flush(frame_changed=True)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('DMX channel %s set to %s', channel, value)
+
+    def set_rgbw_fixture(self, start_channel: int, rgbw: Sequence[int], brightness: int = 100):
+        """
+        Set RGBW values for a fixture starting at the given 0-based frame offset:
+        start_channel=1 uses the DMX channels 2-5, see set_rgbw_fixtures()
+        """
+        self.set_rgbw_fixtures([(start_channel, rgbw, brightness)])
+
+    def set_rgbw_fixtures(self, fixtures: Iterable[tuple[int, Sequence[int], int]]):
+        """
+        Set RGBW values for many fixtures, given as (start_channel, rgbw, brightness),
+        and send all changes with one DMX frame.
+        Unlike the 1-based DMX channel of set_dmx_channel(), start_channel is the 0-based offset
+        in the DMX frame (0-508): The fixture uses the DMX channels start_channel+1 to start_channel+4.
+        """
+        frame_changed = False
+        for start_channel, rgbw, brightness in fixtures:
+            if not 0 <= brightness <= MAX_BRIGHTNESS:
+                logger.error('Invalid brightness for RGBW fixture: %s', brightness)
+                continue
+            if len(rgbw) != 4 or not all(0 <= value <= 255 for value in rgbw):
+                logger.error('Invalid RGBW values for RGBW fixture: %r', rgbw)
+                continue
+            r, g, b, w = scale_rgbw(rgbw, brightness)
+            if not 0 <= start_channel <= 508:  # Need 4 channels
+                logger.error('Invalid start channel (frame offset) for RGBW fixture: %s', start_channel)
+                continue
+            if RGBW_STRUCT.unpack_from(self.dmx_frame, start_channel) == (r, g, b, w):
+                logger.debug('RGBW fixture at frame offset %s is unchanged', start_channel)
+                continue
+            RGBW_STRUCT.pack_into(self.dmx_frame, start_channel, r, g, b, w)
+            frame_changed = True
+            if logger.isEnabledFor(logging.INFO):
+                logger.info('RGBW fixture at frame offset %s set to R=%d, G=%d, B=%d, W=%d', start_channel, r, g, b, w)
+
+        if frame_changed:
+            self._request_flush(frame_changed=True)
+
+    def _request_flush(self, *, frame_changed: bool = False):
+        """
+        Schedule one publish of the light state and, if the frame was changed, one write of the DMX frame.
+        Only the latest request is kept: A pending frame is replaced by a newer one.
+        """
+        frame = bytes(self.dmx_frame) if frame_changed else None
+        with self._flush_lock:
             try:
-                self.device.write_frame(self.dmx_frame)
-                logger.info(f'DMX channel {channel} set to {value}')
-            except Exception as e:
-                logger.error(f'Failed to set DMX channel {channel}: {e}')
-        else:
-            logger.error(f'Invalid DMX channel ({channel}) or value ({value})')
+                pending_frame = self._flush_queue.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                if frame is None:
+                    frame = pending_frame  # Don't drop a pending frame write
+            self._flush_queue.put_nowait(frame)
 
-    @print_exception_decorator
-    def set_rgbw_fixture(self, start_channel: int, rgbw: list[int], brightness:int=100):
-        b_factor = brightness / MAX_BRIGHTNESS
-        r, g, b, w = rgbw
-        r = int(r * b_factor)
-        g = int(g * b_factor)
-        b = int(b * b_factor)
-        w = int(w * b_factor)
-        """Set RGBW values for a fixture starting at the given channel"""
-        if 1 <= start_channel <= 510:  # Need at least 3 channels
-            self.dmx_frame[start_channel] = r
-            self.dmx_frame[start_channel + 1] = g
-            self.dmx_frame[start_channel + 2] = b
-            self.dmx_frame[start_channel + 3] = w
+    def _flush_loop(self):
+        """
+        Write the DMX frame and publish the light state, off the MQTT network thread.
+        """
+        write_frame = self.device.write_frame
+        while True:
+            frame = self._flush_queue.get()
+
+            # Collect a burst of Home Assistant commands:
+            time.sleep(FLUSH_DELAY)
+            with self._flush_lock:
+                try:
+                    newer_frame = self._flush_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                else:
+                    if newer_frame is not None:
+                        frame = newer_frame
+
+            if frame is not None and frame != self._last_sent_frame:
+                try:
+                    write_frame(frame)
+                except Exception as e:
+                    logger.error('Failed to write DMX frame: %s', e)
+                else:
+                    self._last_sent_frame = frame
             try:
-                self.device.write_frame(self.dmx_frame)
-                logger.info(f'RGBW fixture at channel {start_channel} set to R={r}, G={g}, B={b}, W={w}')
+                self.publish_component(self.dmx_light, state_changed=True)
             except Exception as e:
-                logger.error(f'Failed to set RGBW fixture: {e}')
-        else:
-            logger.error(f'Invalid start channel for RGBW fixture: {start_channel}')
+                logger.error('Failed to publish DMX light state: %s', e)
@@ -49,7 +49,12 @@ class BrickletIndustrialDualRelayMapper(DeviceMapBase):
     @print_exception_decorator
     def poll(self):
         super().poll()
+        self.publish_relays()
 
+    def publish_relays(self):
+        """
+        Read both relays with one request and publish their states back-to-back.
+        """
         relay0value, relay1value = self.device.get_value()
 
         if relay0value:
@@ -70,7 +75,7 @@ class BrickletIndustrialDualRelayMapper(DeviceMapBase):
         turn_relay_on = new_state == self.relay0_switch.ON
         self.device.set_selected_value(channel=0, value=turn_relay_on)
 
-        self.poll()
+        self.publish_relays()
 
     @print_exception_decorator
     def relay1_callback(self, *, client: Client, component: Switch, old_state: str, new_state: str):
@@ -78,4 +83,4 @@ class BrickletIndustrialDualRelayMapper(DeviceMapBase):
         turn_relay_on = new_state == self.relay1_switch.ON
         self.device.set_selected_value(channel=1, value=turn_relay_on)
 
-        self.poll()
+        self.publish_relays()
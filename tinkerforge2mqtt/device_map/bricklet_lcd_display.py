@@ -1,4 +1,5 @@
 import logging
+from threading import Lock
 
 from ha_services.mqtt4homeassistant.components.text import Text
 from paho.mqtt.client import Client
@@ -11,6 +12,11 @@ from tinkerforge2mqtt.device_map_utils.utils import print_exception_decorator
 
 logger = logging.getLogger(__name__)
 
+MAX_ROWS = 8  # Text lines of the display, using write_line()
+MAX_COLS = 21  # Characters per line, using write_line()
+LINE_HEIGHT = 8  # Pixel rows per text line
+DISPLAY_WIDTH = 128  # Pixel columns
+
 
 @register_map_class()
 class BrickletLCD128x64Mapper(DeviceMapBase):
@@ -19,6 +25,10 @@ class BrickletLCD128x64Mapper(DeviceMapBase):
 
     def __init__(self, *, device: BrickletLCD128x64, **kwargs):
         self.device: BrickletLCD128x64 = device
+        self._last_lines: list[bytes]  # Current text on the display, see _forget_display_content()
+        self._forget_display_content()  # The bricklet keeps the text of a previous run
+        self._line_scratch: list[bytes] = [b''] * MAX_ROWS  # Swapped with _last_lines after each update
+        self._draw_lock = Lock()
         super().__init__(device=device, **kwargs)
 
     @print_exception_decorator
@@ -32,41 +42,94 @@ class BrickletLCD128x64Mapper(DeviceMapBase):
             uid='display',
             callback=self.display_callback,
         )
-        logger.info(f'Creating: {self.lcd_display}')
+        logger.info('Creating: %s', self.lcd_display)
 
     @print_exception_decorator
     def setup_callbacks(self):
-       pass  # TODO
+        super().setup_callbacks()
+
+        # Collect all changes in the display buffer and draw them at once, see display_callback():
+        config = self.device.get_display_configuration()
+        self.device.set_display_configuration(
+            contrast=config.contrast,
+            backlight=config.backlight,
+            invert=config.invert,
+            automatic_draw=False,
+        )
 
     @print_exception_decorator
     def poll(self):
         super().poll()
-        # LCD displays don't need regular polling for state updates
-        # The display state is maintained by the device itself
-        self.lcd_display.publish(self.mqtt_client)
+        # LCD displays don't need regular polling for state updates:
+        # The text only changes in display_callback() and is published there.
+        self.publish_component(self.lcd_display)
 
 
-    @print_exception_decorator
     def display_callback(self, *, client: Client, component: Text, old_state: str, new_state: str):
-        logger.info(f'{component.name} text changed: {old_state!r} -> {new_state!r}')
-        # Split text into lines (max 4 lines, 21 chars each)
-        lines = new_state.strip().split('\n')
-        lines = [lines.strip() for lines in lines if lines.strip()][:8]
+        logger.info('%s text changed: %r -> %r', component.name, old_state, new_state)
+        if new_state == old_state:
+            return
+        with self._draw_lock:
+            self._draw_text(new_state)
+        self.publish_component(self.lcd_display, state_changed=True)
+
+    def device_reconnected(self):
+        super().device_reconnected()
+        # A restarted bricklet shows an empty display: Draw the current text again
+        with self._draw_lock:
+            self._forget_display_content()
+            if isinstance(text := self.lcd_display.state, str):  # Not set before the first display_callback()
+                self._draw_text(text)
+
+    def _draw_text(self, new_state: str):
+        """
+        Draw only the changed lines of the text on the display.
+        The caller must hold _draw_lock: The MQTT and the Tinkerforge callback thread draw, see device_reconnected().
+        """
+        # Split into lines and encode them once (the bricklet accepts only chars <= 255), e.g.:
+        # ' Foo \r\n\nBär ✓' -> [b'Foo', b'B\xe4r ?', b'', ...]
+        lines = self._line_scratch
+        line_count = 0
+        for line in new_state.splitlines():
+            if line := line.strip():
+                lines[line_count] = line.encode('latin-1', 'replace')[:MAX_COLS]
+                line_count += 1
+                if line_count == MAX_ROWS:
+                    break
+        for line_num in range(line_count, MAX_ROWS):
+            lines[line_num] = b''
+
+        last_lines = self._last_lines
+        changed = [line_num for line_num, line_text in enumerate(lines) if line_text != last_lines[line_num]]
         try:
-            # Clear display first
-            self.device.clear_display()
-            # Write up to 4 lines
-            for line_num, line_text in enumerate(lines):
-                if line_text:  # Only write non-empty lines
-                    # Truncate to 21 characters per line
-                    truncated_text = line_text[:21]
-                    self.device.write_line(line_num, 0, truncated_text)
-                    logger.info(f'LCD line {line_num} updated: {truncated_text}')
-            logger.info(f'LCD display updated with {len(lines[:4])} lines')
+            log_info = logger.isEnabledFor(logging.INFO)
+            write_line = self.device.write_line
+            for line_num in changed:
+                line_text = lines[line_num]
+                if len(line_text) < len(last_lines[line_num]):
+                    # A shorter text doesn't overwrite the end of the old one: Clear only this line
+                    y = line_num * LINE_HEIGHT
+                    self.device.draw_box(
+                        0, y, DISPLAY_WIDTH - 1, y + LINE_HEIGHT - 1, fill=True, color=self.device.COLOR_WHITE
+                    )
+                if line_text:
+                    write_line(line_num, 0, line_text)
+                    if log_info:
+                        logger.info('LCD line %d updated: %r', line_num, line_text)
+            if changed:
+                self.device.draw_buffered_frame(force_complete_redraw=False)
+            self._last_lines, self._line_scratch = lines, last_lines
+            logger.info('LCD display updated %d lines', len(changed))
             self.lcd_display.set_state(new_state)
         except Exception as e:
             self.device.write_line(0, 0, 'Fail to write LCD')
+            self.device.draw_buffered_frame(force_complete_redraw=False)
+            self._forget_display_content()
             self.lcd_display.set_state('Fail to write LCD')
-            logger.error(f'Failed to write to LCD display: {e}')
+            logger.error('Failed to write to LCD display: %s', e)
 
-        self.poll()  # Refresh state after update
+    def _forget_display_content(self):
+        """
+        Assume full lines of unknown text, so that the next update clears and rewrites every line.
+        """
+        self._last_lines = [b' ' * MAX_COLS] * MAX_ROWS
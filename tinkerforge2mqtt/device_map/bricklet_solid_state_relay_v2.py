@@ -48,7 +48,9 @@ class BrickletSolidStateRelayV2Mapper(DeviceMapBase):
     @print_exception_decorator
     def poll(self):
         super().poll()
+        self.publish_relay()
 
+    def publish_relay(self):
         state: bool = self.device.get_state()
         logger.info(f'Polling {state=} from {self.relay_switch}')
         if state:
@@ -65,4 +67,4 @@ class BrickletSolidStateRelayV2Mapper(DeviceMapBase):
         else:
             self.device.set_state(False)
 
-        self.poll()
+        self.publish_relay()
@@ -1,6 +1,8 @@
 import abc
 import logging
+import time
 
+from ha_services.mqtt4homeassistant.components import BaseComponent
 from ha_services.mqtt4homeassistant.components.sensor import Sensor
 from ha_services.mqtt4homeassistant.device import MainMqttDevice, MqttDevice
 from paho.mqtt.client import Client
@@ -15,6 +17,8 @@ from tinkerforge2mqtt.user_settings import UserSettings
 
 logger = logging.getLogger(__name__)
 
+REPUBLISH_INTERVAL = 60  # seconds between publishing an unchanged state, see publish_component()
+
 
 class DeviceMapBase(abc.ABC):
     device_identifier: int
@@ -33,6 +37,8 @@ class DeviceMapBase(abc.ABC):
         self.mqtt_client = mqtt_client
         self.user_settings = user_settings
 
+        self._next_state_publish: dict[BaseComponent, float] = {}  # see publish_component()
+
         self.mqtt_device = MqttDevice(
             main_device=main_mqtt_device,
             name=f'{device.device_display_name} ({device.uid_string})',
@@ -68,6 +74,14 @@ class DeviceMapBase(abc.ABC):
     def setup_callbacks(self):
         pass
 
+    def device_reconnected(self):
+        """
+        Called if a known device is enumerated again, after it (or the connection to it) was lost:
+        The device may have been restarted, so set it up again.
+        """
+        logger.info(f'Setup {self} again')
+        self.setup_callbacks()
+
     def iter_known_functions(self, device: Device):
         assert (
             device.device_identifier == self.device_identifier
@@ -91,6 +105,20 @@ class DeviceMapBase(abc.ABC):
 
         self.main_mqtt_device.poll_and_publish(self.mqtt_client)
 
+    def publish_component(self, component: BaseComponent, *, state_changed: bool = False):
+        """
+        Publish a component whose state only changes in callbacks:
+        The config on every call (throttled by ha_services, it also renews the command subscription),
+        the state only if it changed, was throttled before or is older than REPUBLISH_INTERVAL.
+        """
+        component.publish_config(self.mqtt_client)
+        if state_changed or time.monotonic() >= self._next_state_publish.get(component, 0):
+            if component.publish_state(self.mqtt_client) is None:
+                # Throttled by ha_services: Publish the latest state with the next call
+                self._next_state_publish[component] = 0
+            else:
+                self._next_state_publish[component] = time.monotonic() + REPUBLISH_INTERVAL
+
     def get_sw_version(self) -> str:
         api_version = self.device.get_api_version()
         sw_version = '.'.join(str(number) for number in api_version)
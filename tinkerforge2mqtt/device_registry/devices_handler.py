@@ -1,5 +1,6 @@
 import logging
 import socket
+import threading
 
 from ha_services.mqtt4homeassistant.device import MainMqttDevice
 from paho.mqtt.client import Client
@@ -34,6 +35,10 @@ class DevicesHandler:
         )
 
         self.map_instances = {}
+        self.inactive_uids = set()  # Known devices that are currently not connected
+
+        # Will be set by disconnected_handler() if the connection to brickd is lost:
+        self.connection_lost = threading.Event()
 
     def __call__(
         self,
@@ -47,39 +52,78 @@ class DevicesHandler:
     ):
         if enumeration_type == IPConnection.ENUMERATION_TYPE_DISCONNECTED:
             logger.warning(f'Disconnected: {uid=}')
+            if uid in self.map_instances:
+                self.inactive_uids.add(uid)  # Don't poll it until it's connected again
             return
 
         if map_instance := self.map_instances.get(uid):
             logger.debug(f'Already initialized: {uid=} {device_identifier=} {map_instance=}')
+            if enumeration_type == IPConnection.ENUMERATION_TYPE_CONNECTED or uid in self.inactive_uids:
+                # The device was (re-)started and lost its configuration and output state:
+                self.inactive_uids.discard(uid)
+                try:
+                    map_instance.device_reconnected()
+                except (Exception, SystemExit) as err:  # print_exception_decorator raises SystemExit
+                    logger.error(f'Setup {map_instance} again failed: {(err.__cause__ or err)!r} ({uid=})')
         else:
             logger.info(f'New device: {uid=} {device_identifier=}')
+            try:
+                map_instance = self.create_map_instance(uid, device_identifier)
+            except (Exception, SystemExit) as err:  # print_exception_decorator raises SystemExit
+                # Don't end the Tinkerforge callback thread: The device is set up again with the next enumeration
+                logger.error(f'Setup new device failed: {(err.__cause__ or err)!r} ({uid=} {device_identifier=})')
+                return
+            if map_instance is None:
+                return
+            self.map_instances[uid] = map_instance
 
-            TinkerforgeDeviceClass = get_device_class(device_identifier)
-            name = f'{TinkerforgeDeviceClass.DEVICE_DISPLAY_NAME} ({TinkerforgeDeviceClass.__name__})'
-            logger.info(name)
+        self.poll_device(uid, map_instance)
 
-            MapClass = map_registry.get_map_class(device_identifier)
-            if not MapClass:
-                logger.error(f'No mapper found for {TinkerforgeDeviceClass.__name__} ({device_identifier=})')
-                return
+    def create_map_instance(self, uid, device_identifier):
+        TinkerforgeDeviceClass = get_device_class(device_identifier)
+        name = f'{TinkerforgeDeviceClass.DEVICE_DISPLAY_NAME} ({TinkerforgeDeviceClass.__name__})'
+        logger.info(name)
 
-            device: Device = TinkerforgeDeviceClass(
-                uid=uid,
-                ipcon=self.ipcon,
-            )
-
-            map_instance = MapClass(
-                main_mqtt_device=self.main_mqtt_device,
-                device=device,
-                mqtt_client=self.mqtt_client,
-                user_settings=self.user_settings,
-            )
-            self.map_instances[uid] = map_instance
+        MapClass = map_registry.get_map_class(device_identifier)
+        if not MapClass:
+            logger.error(f'No mapper found for {TinkerforgeDeviceClass.__name__} ({device_identifier=})')
+            return None
+
+        device: Device = TinkerforgeDeviceClass(
+            uid=uid,
+            ipcon=self.ipcon,
+        )
+
+        return MapClass(
+            main_mqtt_device=self.main_mqtt_device,
+            device=device,
+            mqtt_client=self.mqtt_client,
+            user_settings=self.user_settings,
+        )
 
-        map_instance.poll()
+    def poll(self):
+        """
+        Poll all connected devices. Called periodically from the main loop.
+        """
+        # The enumerate callback may add new devices in the meantime, so iterate over a copy:
+        for uid, map_instance in list(self.map_instances.items()):
+            if uid not in self.inactive_uids:
+                self.poll_device(uid, map_instance)
+
+    def poll_device(self, uid, map_instance):
+        """
+        Poll one device: A failing device must not stop the polling of all other devices.
+        """
+        try:
+            map_instance.poll()
+        except (Exception, SystemExit) as err:  # print_exception_decorator raises SystemExit
+            logger.error(f'Polling {map_instance} failed: {(err.__cause__ or err)!r} ({uid=})')
 
     def connected_handler(self, *args, **kwargs):
         print('Connected!', args, kwargs, self.ipcon.devices)
 
-    def disconnected_handler(self, *args, **kwargs):
-        print('Disconnected!', args, kwargs)
+    def disconnected_handler(self, disconnect_reason: int):
+        logger.warning(f'Disconnected: {disconnect_reason=}')
+        # The devices may be restarted (e.g.: a rebooted ESP32 Brick), so set them up again after reconnecting:
+        self.inactive_uids.update(self.map_instances)
+        self.connection_lost.set()
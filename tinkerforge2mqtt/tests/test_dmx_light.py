@@ -0,0 +1,99 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from ha_services.mqtt4homeassistant.components import BaseComponent
+from tinkerforge.bricklet_dmx import BrickletDMX
+from tinkerforge.ip_connection import IPConnection
+
+from tinkerforge2mqtt.device_map import bricklet_dmx_light
+from tinkerforge2mqtt.device_map.bricklet_dmx_light import BrickletDMXMapper
+from tinkerforge2mqtt.device_map_utils.base import DeviceMapBase
+
+
+class FakeDMXDevice(BrickletDMX):
+    """
+    DMX bricklet without a brickd connection, that records the written frames.
+    """
+
+    def __init__(self):
+        super().__init__(uid='FakeDMX', ipcon=IPConnection())
+        self.frames = []
+
+    def set_dmx_mode(self, dmx_mode):
+        pass
+
+    def write_frame(self, frame):
+        self.frames.append(bytes(frame))
+
+
+class DMXLightFlushTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.device = FakeDMXDevice()
+
+        # Skip the MQTT setup and don't start the writer thread, see start_writer():
+        with patch.object(DeviceMapBase, '__init__', return_value=None), patch.object(bricklet_dmx_light, 'Thread'):
+            self.mapper = BrickletDMXMapper(device=self.device)
+        self.mapper.mqtt_client = MagicMock()
+        self.mapper.dmx_light = MagicMock(spec=BaseComponent)
+        self.mapper._next_state_publish = {}
+
+    def start_writer(self):
+        threading.Thread(target=self.mapper._flush_loop, daemon=True).start()
+
+    def wait_for_flushes(self, count: int):
+        publish_state = self.mapper.dmx_light.publish_state
+        deadline = time.monotonic() + 2
+        while publish_state.call_count < count:
+            self.assertLess(time.monotonic(), deadline, f'Only {publish_state.call_count} of {count} flushes')
+            time.sleep(0.01)
+
+        time.sleep(bricklet_dmx_light.FLUSH_DELAY * 5)  # Catch unexpected flushes
+        self.assertEqual(publish_state.call_count, count)
+
+    def expected_frame(self, channels: dict[int, int]) -> bytes:
+        frame = bytearray(512)
+        for channel, value in channels.items():
+            frame[channel - 1] = value  # DMX channels are 1-based
+        return bytes(frame)
+
+    def test_burst_is_written_once(self):
+        self.start_writer()
+        with patch.object(bricklet_dmx_light, 'FLUSH_DELAY', 0.2):
+            self.mapper.set_dmx_channel(1, 10)
+            self.mapper.set_dmx_channel(2, 20)
+            self.mapper.set_rgbw_fixture(start_channel=4, rgbw=(1, 2, 3, 4), brightness=255)
+            self.mapper._request_flush()  # e.g. from a callback that doesn't change the frame
+            self.wait_for_flushes(1)
+
+        self.assertEqual(
+            self.device.frames,
+            [self.expected_frame({1: 10, 2: 20, 5: 1, 6: 2, 7: 3, 8: 4})],
+        )
+
+    def test_state_only_request_keeps_pending_frame(self):
+        self.mapper.set_dmx_channel(1, 255)
+        self.mapper._request_flush()  # e.g. from a callback that doesn't change the frame
+
+        self.assertEqual(self.mapper._flush_queue.qsize(), 1)
+        self.assertEqual(self.mapper._flush_queue.queue[0], self.expected_frame({1: 255}))
+
+        self.start_writer()
+        self.wait_for_flushes(1)
+        self.assertEqual(self.device.frames, [self.expected_frame({1: 255})])
+
+    def test_unchanged_frame_is_not_resent(self):
+        self.start_writer()
+        self.mapper.set_dmx_channel(1, 1)
+        self.wait_for_flushes(1)
+
+        self.mapper._request_flush(frame_changed=True)
+        self.wait_for_flushes(2)
+        self.assertEqual(self.device.frames, [self.expected_frame({1: 1})])
+
+        # A restarted bricklet needs the unchanged frame again:
+        self.mapper.device_reconnected()
+        self.wait_for_flushes(3)
+        self.assertEqual(self.device.frames, [self.expected_frame({1: 1})] * 2)
@@ -0,0 +1,45 @@
+from collections.abc import Sequence
+from functools import lru_cache
+
+
+MAX_BRIGHTNESS = 255
+
+
+@lru_cache(maxsize=MAX_BRIGHTNESS + 1)
+def brightness_lut(brightness: int) -> bytes:
+    """
+    Lookup table to scale a 0-255 channel value by the given brightness (0-MAX_BRIGHTNESS)
+
+    >>> lut = brightness_lut(MAX_BRIGHTNESS)
+    >>> lut[0], lut[128], lut[255]
+    (0, 128, 255)
+    >>> lut = brightness_lut(128)
+    >>> lut[0], lut[128], lut[255]
+    (0, 64, 128)
+    """
+    return bytes((value * brightness) // MAX_BRIGHTNESS for value in range(256))
+
+
+def scale_rgbw(
+    rgbw: Sequence[int],  # Red, green, blue and white channel values 0-255
+    brightness: int,  # 0-MAX_BRIGHTNESS
+) -> tuple[int, int, int, int]:
+    """
+    Scale the RGBW channel values by the brightness.
+
+    Examples:
+    >>> scale_rgbw((255, 128, 0, 10), brightness=MAX_BRIGHTNESS)
+    (255, 128, 0, 10)
+    >>> scale_rgbw((255, 128, 0, 10), brightness=128)
+    (128, 64, 0, 5)
+    >>> scale_rgbw((255, 128, 0, 10), brightness=0)
+    (0, 0, 0, 0)
+    """
+    if brightness == 0:  # e.g.: Light switched off
+        return 0, 0, 0, 0
+    if brightness == MAX_BRIGHTNESS:
+        r, g, b, w = rgbw
+    else:
+        # bytes.translate() scales all channels in one C call:
+        r, g, b, w = bytes(rgbw).translate(brightness_lut(brightness))
+    return r, g, b, w